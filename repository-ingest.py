@@ -3,30 +3,624 @@ import gitingest
 import os
 import sys
 import argparse
+import asyncio
 import json
 import logging
 import datetime
-from typing import Dict, Tuple, Any, Optional
+import errno
+import gzip
+import hashlib
+import importlib.metadata
+import mmap
+import multiprocessing
+import operator
+import re
+import struct
+import subprocess
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Tuple, Any, Optional
+
+try:
+    import aiofiles
+except ImportError:
+    # aiofiles is optional - fall back to the default thread pool executor
+    aiofiles = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    from pathspec import PathSpec
+    try:
+        from gitingest.utils.ignore_patterns import DEFAULT_IGNORE_PATTERNS
+    except ImportError:
+        from gitingest.ignore_patterns import DEFAULT_IGNORE_PATTERNS
+except ImportError:
+    # Without gitingest's ignore rules the prefetch can't tell which files
+    # gitingest will read, so it is skipped
+    PathSpec = None
+
+try:
+    from gitingest.utils.ignore_patterns import load_ignore_patterns
+except ImportError:
+    # Older gitingest releases don't apply .gitignore files either
+    load_ignore_patterns = None
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger('repository_ingest')
 
+
+def _gitingest_version() -> Optional[str]:
+    """
+    Get the installed gitingest version, or None if it can't be determined.
+    """
+    try:
+        return importlib.metadata.version('gitingest')
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+GITINGEST_VERSION = _gitingest_version()
+
+# gitingest releases before 0.2 clone every URL into the same temp directory and
+# remove all of it afterwards, so concurrent URL ingests would clobber each other.
+# An unknown version is treated as old.
+GITINGEST_SHARES_CLONE_DIR = (
+    GITINGEST_VERSION is None
+    or tuple(int(n) for n in re.findall(r'\d+', GITINGEST_VERSION)[:2]) < (0, 2)
+)
+
+# Number of characters encoded and written per chunk. Writing a large string in
+# one call makes the text layer encode a full copy of it before writing.
+WRITE_CHUNK_CHARS = 1 << 20
+
+# Encoded chunks gathered into a single writev call
+WRITEV_BATCH = 4
+
+# Seconds a get_repo_dirs listing is reused before the temp directory is rescanned
+REPO_DIRS_CACHE_TTL = 1.0
+
+# Content larger than this is written with O_DIRECT (where supported) so a
+# one-off write of a huge file does not evict the rest of the page cache
+DIRECT_IO_THRESHOLD = 16 << 20
+DIRECT_IO_ALIGN = 4096
+
+# Room for one encoded chunk (up to 4 bytes per character) plus the unaligned
+# remainder carried over from the previous chunk
+STAGING_BUFFER_SIZE = DIRECT_IO_ALIGN + 4 * WRITE_CHUNK_CHARS
+
+# Number of O_DIRECT staging buffers kept for reuse once a write finishes
+STAGING_POOL_SIZE = 4
+
+# Prefetching warms the page cache for gitingest's serial walk of local directories.
+# Files above gitingest's default max_file_size are never read, so they are skipped,
+# as are files matching gitingest's default ignore patterns or the repository's
+# ignore files.
+PREFETCH_WORKERS = 8
+PREFETCH_MAX_FILE_SIZE = 10 * 1024 * 1024
+PREFETCH_IGNORE_FILES = ('.gitignore', '.gitingestignore')
+
+# Local repositories with at least this many files, averaging below this size,
+# keep gitingest busy with per-file Python work rather than I/O. Batches ingest
+# them in worker processes, since threads would serialize on the GIL. Files are
+# counted by the prefetch walk.
+CPU_BOUND_MIN_FILES = 500
+CPU_BOUND_MAX_AVG_FILE_SIZE = 16 * 1024
+
+# Subdirectory of temp_dir holding gitingest results keyed by repository HEAD.
+# Entries unused for INGEST_CACHE_MAX_AGE seconds are evicted, as are the least
+# recently used ones once the directory grows past INGEST_CACHE_MAX_SIZE bytes.
+INGEST_CACHE_DIR = '.ingest_cache'
+INGEST_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+INGEST_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+
+# Cache files store each text as UTF-8 chunks, each preceded by its byte length
+# in this format, and end each text with a zero length
+INGEST_CACHE_CHUNK_HEADER = struct.Struct('>I')
+
+# Output file names are the repository identifier followed by these suffixes
+OUTPUT_SUFFIXES = ('_summary.txt', '_tree.txt', '_content.txt', '_metadata.json')
+
+# Fixed layout of the metadata file, matching json.dumps(metadata, indent=2).
+# Placeholders for strings must be filled with JSON-encoded values.
+METADATA_TEMPLATE = (
+    '{{\n'
+    '  "repository_id": {repository_id},\n'
+    '  "processed_at": {processed_at},\n'
+    '  "files": {{\n'
+    '    "summary": {summary_file},\n'
+    '    "tree": {tree_file},\n'
+    '    "content": {content_file}\n'
+    '  }},\n'
+    '  "stats": {{\n'
+    '    "summary_length": {summary_length},\n'
+    '    "tree_length": {tree_length},\n'
+    '    "content_length": {content_length}{extra_stats}\n'
+    '  }}\n'
+    '}}'
+)
+
+# File suffix appended to the content file for each supported compression format
+COMPRESSION_SUFFIXES = {
+    'zstd': '.zst',
+    'gzip': '.gz',
+}
+
+
+def _write_all(fd: int, data: memoryview) -> None:
+    """
+    Write a buffer to a file descriptor, retrying on short writes.
+    """
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def _writev_all(fd: int, buffers: list) -> None:
+    """
+    Write a list of buffers to a file descriptor with one writev call.
+    """
+    written = os.writev(fd, buffers)
+    if written < sum(map(len, buffers)):
+        # Short write - finish the remainder with plain writes
+        _write_all(fd, memoryview(b''.join(buffers))[written:])
+
+
+def _write_file(path: str, data: str) -> int:
+    """
+    Write text to a file using UTF-8 encoding, streaming it in chunks.
+    
+    Where writev is available the file is written through a raw descriptor,
+    WRITEV_BATCH encoded chunks per system call, bypassing the buffered text
+    layer. Elsewhere (Windows) a regular text file is used.
+    
+    Returns:
+        Number of characters written
+    """
+    written = 0
+    
+    if not hasattr(os, 'writev'):
+        with open(path, 'w', encoding='utf-8') as f:
+            for start in range(0, len(data), WRITE_CHUNK_CHARS):
+                written += f.write(data[start:start + WRITE_CHUNK_CHARS])
+        return written
+    
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        batch = []
+        for start in range(0, len(data), WRITE_CHUNK_CHARS):
+            chunk = data[start:start + WRITE_CHUNK_CHARS]
+            written += len(chunk)
+            batch.append(chunk.encode('utf-8'))
+            if len(batch) == WRITEV_BATCH:
+                _writev_all(fd, batch)
+                batch = []
+        if batch:
+            _writev_all(fd, batch)
+    finally:
+        os.close(fd)
+    
+    return written
+
+
+_staging_pool = []
+_staging_lock = threading.Lock()
+
+
+def _acquire_staging_buffer() -> mmap.mmap:
+    """
+    Take a page-aligned staging buffer from the pool, allocating one if it is empty.
+    """
+    with _staging_lock:
+        if _staging_pool:
+            return _staging_pool.pop()
+    return mmap.mmap(-1, STAGING_BUFFER_SIZE)
+
+
+def _release_staging_buffer(buffer: mmap.mmap) -> None:
+    """
+    Return a staging buffer to the pool, or unmap it if the pool is full.
+    """
+    with _staging_lock:
+        if len(_staging_pool) < STAGING_POOL_SIZE:
+            _staging_pool.append(buffer)
+            return
+    buffer.close()
+
+
+def _write_file_direct(path: str, data: str) -> int:
+    """
+    Write text to a file using UTF-8 encoding and O_DIRECT.
+    
+    Chunks are encoded into a page-aligned staging buffer and written in
+    block-aligned lengths; the zero-padded tail is truncated off at the end.
+    Staging buffers are pooled, so a long-running process pays for allocating
+    and faulting them in only once.
+    Falls back to _write_file where O_DIRECT is unavailable or rejected by
+    the filesystem.
+    
+    Returns:
+        Number of characters written
+    """
+    o_direct = getattr(os, 'O_DIRECT', 0)
+    if not o_direct:
+        return _write_file(path, data)
+    
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | o_direct, 0o666)
+    except OSError as e:
+        if e.errno != errno.EINVAL:
+            raise
+        return _write_file(path, data)
+    
+    staging = _acquire_staging_buffer()
+    try:
+        with memoryview(staging) as view:
+            filled = 0
+            total = 0
+            written = 0
+            for start in range(0, len(data), WRITE_CHUNK_CHARS):
+                chunk = data[start:start + WRITE_CHUNK_CHARS]
+                written += len(chunk)
+                encoded = chunk.encode('utf-8')
+                view[filled:filled + len(encoded)] = encoded
+                filled += len(encoded)
+                total += len(encoded)
+                
+                aligned = filled - filled % DIRECT_IO_ALIGN
+                _write_all(fd, view[:aligned])
+                view[:filled - aligned] = view[aligned:filled]
+                filled -= aligned
+            
+            if filled:
+                padded = filled + (-filled % DIRECT_IO_ALIGN)
+                view[filled:padded] = bytes(padded - filled)
+                _write_all(fd, view[:padded])
+        
+        os.ftruncate(fd, total)
+    except OSError as e:
+        if e.errno != errno.EINVAL:
+            raise
+        os.close(fd)
+        fd = None
+        written = _write_file(path, data)
+    finally:
+        _release_staging_buffer(staging)
+        if fd is not None:
+            os.close(fd)
+    
+    return written
+
+
+def _check_compression(compress: Optional[str]) -> None:
+    """
+    Validate a compression format before any output file is written.
+    """
+    if not compress:
+        return
+    if compress not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unsupported compression format: {compress}")
+    if compress == 'zstd' and zstandard is None:
+        raise ImportError("zstd compression requires the zstandard package")
+
+
+def _compressed_writer(f, compress: str):
+    """
+    Wrap a binary file in a zstd or gzip compressing stream.
+    """
+    if compress == 'zstd':
+        return zstandard.ZstdCompressor(level=3, threads=-1).stream_writer(f)
+    return gzip.GzipFile(fileobj=f, mode='wb')
+
+
+def _compressed_reader(f, compress: str):
+    """
+    Wrap a binary file in a zstd or gzip decompressing stream.
+    """
+    if compress == 'zstd':
+        return zstandard.ZstdDecompressor().stream_reader(f)
+    return gzip.GzipFile(fileobj=f, mode='rb')
+
+
+def _read_exact(reader, size: int) -> bytes:
+    """
+    Read exactly size bytes from a stream.
+    
+    Raises:
+        EOFError: If the stream ends first
+    """
+    parts = []
+    while size:
+        part = reader.read(size)
+        if not part:
+            raise EOFError("Truncated ingest cache file")
+        parts.append(part)
+        size -= len(part)
+    return b''.join(parts)
+
+
+def _write_ingest_cache(path: str, texts: Tuple[str, ...], compress: str) -> None:
+    """
+    Stream texts into a compressed ingest cache file, one chunk at a time.
+    """
+    with open(path, 'wb') as f:
+        with _compressed_writer(f, compress) as writer:
+            for text in texts:
+                for start in range(0, len(text), WRITE_CHUNK_CHARS):
+                    chunk = text[start:start + WRITE_CHUNK_CHARS].encode('utf-8')
+                    writer.write(INGEST_CACHE_CHUNK_HEADER.pack(len(chunk)))
+                    writer.write(chunk)
+                writer.write(INGEST_CACHE_CHUNK_HEADER.pack(0))
+
+
+def _read_ingest_cache(path: str, count: int, compress: str) -> Tuple[str, ...]:
+    """
+    Read count texts back from a compressed ingest cache file.
+    """
+    texts = []
+    with open(path, 'rb') as f:
+        with _compressed_reader(f, compress) as reader:
+            for _ in range(count):
+                chunks = []
+                while True:
+                    (size,) = INGEST_CACHE_CHUNK_HEADER.unpack(
+                        _read_exact(reader, INGEST_CACHE_CHUNK_HEADER.size))
+                    if not size:
+                        break
+                    chunks.append(_read_exact(reader, size).decode('utf-8'))
+                texts.append(''.join(chunks))
+    return tuple(texts)
+
+
+def _prune_ingest_cache(cache_dir: str) -> None:
+    """
+    Evict ingest cache files past INGEST_CACHE_MAX_AGE or INGEST_CACHE_MAX_SIZE.
+    
+    Files are aged by modification time, which cache hits refresh.
+    """
+    cutoff = time.time() - INGEST_CACHE_MAX_AGE
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            try:
+                st = entry.stat(follow_symlinks=False)
+                if st.st_mtime < cutoff:
+                    os.unlink(entry.path)
+                else:
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+            except OSError:
+                continue
+    
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= INGEST_CACHE_MAX_SIZE:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def _write_file_compressed(path: str, data: str, compress: str) -> Tuple[int, int]:
+    """
+    Write text to a zstd or gzip compressed file using UTF-8 encoding.
+    
+    Returns:
+        Number of characters written and size of the compressed file in bytes
+    """
+    _check_compression(compress)
+    
+    written = 0
+    with open(path, 'wb') as f:
+        with _compressed_writer(f, compress) as writer:
+            for start in range(0, len(data), WRITE_CHUNK_CHARS):
+                chunk = data[start:start + WRITE_CHUNK_CHARS]
+                written += len(chunk)
+                writer.write(chunk.encode('utf-8'))
+    
+    return written, os.path.getsize(path)
+
+
+def _ignore_spec(root: str) -> 'PathSpec':
+    """
+    Build the set of paths gitingest skips when walking a local directory.
+    """
+    patterns = set(DEFAULT_IGNORE_PATTERNS)
+    if load_ignore_patterns is not None:
+        for filename in PREFETCH_IGNORE_FILES:
+            patterns.update(load_ignore_patterns(Path(root), filename=filename))
+    return PathSpec.from_lines('gitwildmatch', patterns)
+
+
+def _prefetch_dir(root: str, path: str, spec: 'PathSpec') -> Tuple[list, int, int]:
+    """
+    Issue readahead hints for the files directly inside a directory.
+    
+    Returns:
+        Paths of the subdirectories still to be visited, and the number and
+        total size of the files gitingest will read
+    """
+    subdirs = []
+    file_count = 0
+    total_size = 0
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                rel_path = os.path.relpath(entry.path, root)
+                if entry.is_dir(follow_symlinks=False):
+                    if not spec.match_file(rel_path + '/'):
+                        subdirs.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    if spec.match_file(rel_path):
+                        continue
+                    size = entry.stat(follow_symlinks=False).st_size
+                    if size > PREFETCH_MAX_FILE_SIZE:
+                        continue
+                    file_count += 1
+                    total_size += size
+                    if size and hasattr(os, 'posix_fadvise'):
+                        fd = os.open(entry.path, os.O_RDONLY)
+                        try:
+                            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                        finally:
+                            os.close(fd)
+    except OSError as e:
+        logger.debug("Skipping prefetch of %s: %s", path, e)
+    return subdirs, file_count, total_size
+
+
+def _prefetch_tree(root: str) -> Tuple[int, int]:
+    """
+    Start reading a local repository's files into the page cache in parallel.
+    
+    gitingest walks and reads a directory one file at a time. Scanning the tree
+    on a thread pool first (one task per directory) and asking the kernel to
+    read ahead lets the disk work on many files at once, so gitingest's own pass
+    is served mostly from the page cache. Only files gitingest would read are
+    prefetched. Without posix_fadvise the files are only counted, and without
+    gitingest's ignore patterns the tree isn't walked at all.
+    
+    Returns:
+        Number and total size of the files gitingest will read
+    """
+    if PathSpec is None:
+        return 0, 0
+    
+    spec = _ignore_spec(root)
+    file_count = 0
+    total_size = 0
+    with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS) as pool:
+        pending = {pool.submit(_prefetch_dir, root, root, spec)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                subdirs, count, size = future.result()
+                file_count += count
+                total_size += size
+                pending.update(pool.submit(_prefetch_dir, root, d, spec) for d in subdirs)
+    return file_count, total_size
+
+
+def _is_cpu_bound(file_count: int, total_size: int) -> bool:
+    """
+    Guess whether ingesting a local repository is dominated by CPU rather than I/O.
+    """
+    return (file_count >= CPU_BOUND_MIN_FILES
+            and total_size < file_count * CPU_BOUND_MAX_AVG_FILE_SIZE)
+
+
+def _run_gitingest(repo_path: str) -> Tuple[str, str, str]:
+    """
+    Run gitingest on a repository.
+    
+    Returns:
+        Tuple of summary, tree and content text
+    """
+    return gitingest.ingest(repo_path)
+
+
+def _timestamp() -> str:
+    """
+    Get the current UTC time as an ISO 8601 string with second precision.
+    """
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')
+
+
+def _build_outpaths(output_dir: str, repo_id: str) -> Tuple[str, str, str, str]:
+    """
+    Build the summary, tree, content and metadata file paths for a repository.
+    """
+    prefix = os.path.join(output_dir, repo_id)
+    return tuple(prefix + suffix for suffix in OUTPUT_SUFFIXES)
+
+
+def _render_metadata(repo_id: str,
+                     processed_at: str,
+                     files: Tuple[str, str, str],
+                     lengths: Tuple[int, int, int],
+                     compressed_length: Optional[int] = None) -> bytes:
+    """
+    Render the metadata file from METADATA_TEMPLATE.
+    
+    Args:
+        repo_id: Repository identifier
+        processed_at: ISO 8601 processing timestamp
+        files: Summary, tree and content file paths
+        lengths: Summary, tree and content lengths in characters
+        compressed_length: Size of the compressed content file, if compressed
+        
+    Returns:
+        UTF-8 encoded JSON document
+    """
+    extra_stats = ''
+    if compressed_length is not None:
+        extra_stats = f',\n    "content_compressed_length": {compressed_length}'
+    
+    return METADATA_TEMPLATE.format(
+        repository_id=json.dumps(repo_id),
+        processed_at=json.dumps(processed_at),
+        summary_file=json.dumps(files[0]),
+        tree_file=json.dumps(files[1]),
+        content_file=json.dumps(files[2]),
+        summary_length=lengths[0],
+        tree_length=lengths[1],
+        content_length=lengths[2],
+        extra_stats=extra_stats,
+    ).encode('utf-8')
+
+
+async def _write_file_async(path: str, data: str) -> int:
+    """
+    Write text to a file without blocking the event loop.
+    
+    Returns:
+        Number of characters written
+    """
+    if aiofiles is not None and not hasattr(os, 'writev'):
+        written = 0
+        async with aiofiles.open(path, 'w', encoding='utf-8') as f:
+            for start in range(0, len(data), WRITE_CHUNK_CHARS):
+                written += await f.write(data[start:start + WRITE_CHUNK_CHARS])
+        return written
+    return await asyncio.to_thread(_write_file, path, data)
+
+
+async def _write_content_async(path: str,
+                               data: str,
+                               compress: Optional[str] = None) -> Tuple[int, Optional[int]]:
+    """
+    Write the repository content file without blocking the event loop.
+    
+    Returns:
+        Number of characters written, and the size of the compressed file in
+        bytes (None when not compressed)
+    """
+    if compress:
+        return await asyncio.to_thread(_write_file_compressed, path, data, compress)
+    if len(data) > DIRECT_IO_THRESHOLD:
+        return await asyncio.to_thread(_write_file_direct, path, data), None
+    return await _write_file_async(path, data), None
+
+
 class RepositoryIngest:
     """
     A class to handle repository ingestion using gitingest.
     This processes repositories for analysis by extracting relevant code and structure.
     """
     
-    def __init__(self, temp_dir: str = None):
+    def __init__(self, temp_dir: str = None, use_cache: bool = True):
         """
         Initialize the repository ingestion service.
         
         Args:
             temp_dir: The temporary directory where repositories are cloned
+            use_cache: Reuse gitingest results for unchanged local repositories,
+                stored under temp_dir
         """
         if temp_dir:
             self.temp_dir = temp_dir
@@ -36,40 +630,298 @@ class RepositoryIngest:
             
         # Create temp directory if it doesn't exist
         os.makedirs(self.temp_dir, exist_ok=True)
-        logger.info(f"Using temporary directory: {self.temp_dir}")
+        
+        self.use_cache = use_cache
+        
+        # (timestamp, listing) of the last get_repo_dirs scan
+        self._dirs_cache: Optional[Tuple[float, list]] = None
+        logger.info("Using temporary directory: %s", self.temp_dir)
 
     def get_repo_dirs(self) -> list:
         """
         Get list of repositories in the temporary directory.
         
+        Uses a single scandir pass so the directory check and creation time
+        come from the same cached directory entry. Where supported, the scan
+        runs on a descriptor for temp_dir so each stat is resolved relative to
+        it instead of walking the full path again. The listing is reused for
+        REPO_DIRS_CACHE_TTL seconds.
+        
         Returns:
-            List of repository directory names
+            List of (directory name, creation time) tuples
         """
+        now = time.monotonic()
+        if self._dirs_cache and now - self._dirs_cache[0] < REPO_DIRS_CACHE_TTL:
+            return self._dirs_cache[1]
+        
         try:
-            dirs = [d for d in os.listdir(self.temp_dir) 
-                   if os.path.isdir(os.path.join(self.temp_dir, d))]
+            use_fd = os.scandir in os.supports_fd
+            target = os.open(self.temp_dir, os.O_RDONLY | os.O_DIRECTORY) if use_fd else self.temp_dir
+            try:
+                with os.scandir(target) as it:
+                    dirs = [(e.name, e.stat().st_ctime) for e in it
+                            if e.is_dir(follow_symlinks=False) and e.name != INGEST_CACHE_DIR]
+            finally:
+                if use_fd:
+                    os.close(target)
+            self._dirs_cache = (now, dirs)
             return dirs
         except Exception as e:
-            logger.error(f"Error listing repository directories: {e}")
+            logger.error("Error listing repository directories: %s", e)
             return []
 
+    def _resolve_repo_id(self, repo_path: str) -> str:
+        """
+        Derive an output identifier from a repository path or Git URL.
+        
+        Args:
+            repo_path: Path to the repository directory or a Git URL
+            
+        Returns:
+            Directory name, or the last part of the URL without .git
+        """
+        if os.path.isdir(repo_path):
+            return os.path.basename(os.path.normpath(repo_path))
+        
+        # Assume it's a URL - get last part
+        repo_id = repo_path.split('/')[-1]
+        if repo_id.endswith('.git'):
+            repo_id = repo_id[:-4]
+        return repo_id
+
+    def _ingest_cache_path(self, repo_path: str) -> Optional[str]:
+        """
+        Get the ingest cache file for a local Git repository.
+        
+        Only clean working trees are cached, since gitingest reads the working
+        tree rather than the commit. The repository must be the root of its
+        own work tree, and every file git ignores must also be ignored by
+        gitingest, since git status doesn't report changes to ignored files.
+        The key combines HEAD, the repository path
+        (which appears in the summary) and the gitingest version, so nothing
+        is cached when the installed gitingest version is unknown.
+        
+        Args:
+            repo_path: Path to the repository directory or a Git URL
+            
+        Returns:
+            Path of the cache file, or None if the repository can't be cached
+        """
+        if not self.use_cache or not os.path.isdir(repo_path) or GITINGEST_VERSION is None:
+            return None
+        
+        try:
+            toplevel = subprocess.run(
+                ['git', '-C', repo_path, 'rev-parse', '--show-toplevel'],
+                capture_output=True, text=True, check=True
+            ).stdout.strip()
+            # A subdirectory can hold files ignored by the parent repository
+            if os.path.normcase(os.path.realpath(toplevel)) != os.path.normcase(os.path.realpath(repo_path)):
+                return None
+            
+            status = subprocess.run(
+                ['git', '-C', repo_path, 'status', '--porcelain=v2', '--branch', '--ignored', '-z'],
+                capture_output=True, text=True, check=True
+            ).stdout
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        
+        head = None
+        ignored = []
+        for entry in status.split('\0'):
+            if entry.startswith('# branch.oid '):
+                head = entry.split()[-1]
+            elif entry.startswith('! '):
+                ignored.append(entry[2:])
+            elif entry and not entry.startswith('#'):
+                # Uncommitted or untracked changes
+                return None
+        if not head or head == '(initial)':
+            return None
+        
+        if ignored:
+            # Ignored through .git/info/exclude or core.excludesFile, so
+            # gitingest reads them but changes to them wouldn't be noticed
+            if PathSpec is None:
+                return None
+            spec = _ignore_spec(repo_path)
+            if not all(spec.match_file(path) for path in ignored):
+                return None
+        
+        source = f"{os.path.abspath(repo_path)}\0{GITINGEST_VERSION}"
+        key = f"{head}-{hashlib.sha1(source.encode('utf-8')).hexdigest()[:12]}"
+        suffix = COMPRESSION_SUFFIXES['zstd' if zstandard is not None else 'gzip']
+        return os.path.join(self.temp_dir, INGEST_CACHE_DIR, key + suffix)
+
+    def _ingest(self,
+                repo_path: str,
+                run_cpu_bound: Optional[Callable[[str], Tuple[str, str, str]]] = None
+                ) -> Tuple[str, str, str]:
+        """
+        Run gitingest on a repository, reusing a cached result for the same HEAD.
+        
+        On a cache miss, local directories are prefetched first. The same walk
+        classifies the repository, so only one pass over the tree is made.
+        
+        Args:
+            repo_path: Path to the repository directory or a Git URL
+            run_cpu_bound: Performs the ingest of CPU bound local repositories
+                (by default they are ingested in this process too)
+            
+        Returns:
+            Tuple of summary, tree and content text
+        """
+        cache_file = self._ingest_cache_path(repo_path)
+        compress = 'zstd' if zstandard is not None else 'gzip'
+        
+        if cache_file and os.path.exists(cache_file):
+            try:
+                result = _read_ingest_cache(cache_file, 3, compress)
+                # Refresh the modification time so eviction keeps recently used entries
+                os.utime(cache_file)
+                logger.info("Using cached ingest result: %s", cache_file)
+                return result
+            except Exception as e:
+                logger.warning("Ignoring unreadable ingest cache %s: %s", cache_file, e)
+        
+        run = _run_gitingest
+        # The walk is only worth it for readahead hints or to pick a runner
+        if os.path.isdir(repo_path) and (hasattr(os, 'posix_fadvise') or run_cpu_bound is not None):
+            file_count, total_size = _prefetch_tree(repo_path)
+            if run_cpu_bound is not None and _is_cpu_bound(file_count, total_size):
+                run = run_cpu_bound
+        
+        result = run(repo_path)
+        
+        if cache_file:
+            try:
+                cache_dir = os.path.dirname(cache_file)
+                os.makedirs(cache_dir, exist_ok=True)
+                # Write then rename so concurrent readers never see a partial file
+                tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+                try:
+                    _write_ingest_cache(tmp_file, result, compress)
+                    os.replace(tmp_file, cache_file)
+                finally:
+                    if os.path.exists(tmp_file):
+                        os.unlink(tmp_file)
+                _prune_ingest_cache(cache_dir)
+            except Exception as e:
+                logger.warning("Failed to write ingest cache %s: %s", cache_file, e)
+        
+        return result
+
+    async def _write_outputs(self,
+                             output_dir: str,
+                             repo_id: str,
+                             summary: str,
+                             tree: str,
+                             content: str,
+                             processed_at: str,
+                             compress: Optional[str] = None) -> Dict[str, str]:
+        """
+        Write the output and metadata files for one ingested repository.
+        
+        Args:
+            output_dir: Directory to save output files
+            repo_id: Repository identifier for output naming
+            summary: Summary text produced by gitingest
+            tree: Directory tree text produced by gitingest
+            content: File content text produced by gitingest
+            processed_at: ISO 8601 timestamp recorded in the metadata
+            compress: Compress the content file ('zstd' or 'gzip')
+            
+        Returns:
+            Dictionary with paths to output files
+        """
+        # Create output filenames with repo identifier
+        summary_file, tree_file, content_file, metadata_file = _build_outpaths(output_dir, repo_id)
+        if compress:
+            content_file += COMPRESSION_SUFFIXES[compress]
+        
+        summary_length, tree_length, (content_length, compressed_length) = await asyncio.gather(
+            _write_file_async(summary_file, summary),
+            _write_file_async(tree_file, tree),
+            _write_content_async(content_file, content, compress),
+        )
+        
+        # Lengths come from the writes themselves; writing the metadata last
+        # also means its presence implies the other files are complete
+        metadata = _render_metadata(
+            repo_id, processed_at,
+            (summary_file, tree_file, content_file),
+            (summary_length, tree_length, content_length),
+            compressed_length,
+        )
+        await asyncio.to_thread(Path(metadata_file).write_bytes, metadata)
+        
+        return {
+            "summary_file": summary_file,
+            "tree_file": tree_file,
+            "content_file": content_file,
+            "metadata_file": metadata_file,
+        }
+
     def process_repository(self, 
                           repo_path: str,
                           output_dir: Optional[str] = None,
-                          repo_id: Optional[str] = None) -> Dict[str, str]:
+                          repo_id: Optional[str] = None,
+                          return_text: bool = False,
+                          compress: Optional[str] = None,
+                          processed_at: Optional[str] = None) -> Dict[str, str]:
         """
         Process a repository using gitingest.
         
+        Synchronous wrapper around process_repository_async.
+        
+        Args:
+            repo_path: Path to the repository directory or a Git URL
+            output_dir: Directory to save output files (defaults to temp_dir)
+            repo_id: Repository identifier for output naming
+            return_text: Include the summary, tree and content strings in the result
+            compress: Compress the content file ('zstd' or 'gzip')
+            processed_at: ISO 8601 timestamp for the metadata (defaults to now, UTC)
+            
+        Returns:
+            Dictionary with paths to output files, plus processed content if requested
+        """
+        return asyncio.run(
+            self.process_repository_async(
+                repo_path, output_dir, repo_id, return_text, compress, processed_at
+            )
+        )
+
+    async def process_repository_async(self,
+                                       repo_path: str,
+                                       output_dir: Optional[str] = None,
+                                       repo_id: Optional[str] = None,
+                                       return_text: bool = False,
+                                       compress: Optional[str] = None,
+                                       processed_at: Optional[str] = None) -> Dict[str, str]:
+        """
+        Process a repository using gitingest, writing all output files concurrently.
+        
         Args:
             repo_path: Path to the repository directory or a Git URL
             output_dir: Directory to save output files (defaults to temp_dir)
             repo_id: Repository identifier for output naming
+            return_text: Include the summary, tree and content strings in the result.
+                Leave off for large repositories so the content is not kept in memory
+                after it has been written to disk.
+            compress: Compress the content file ('zstd' or 'gzip')
+            processed_at: ISO 8601 timestamp for the metadata (defaults to now, UTC)
             
         Returns:
-            Dictionary with paths to output files and processed content
+            Dictionary with paths to output files, plus processed content if requested
         """
         try:
-            logger.info(f"Processing repository: {repo_path}")
+            logger.info("Processing repository: %s", repo_path)
+            
+            # Fail before ingesting rather than after writing some of the files
+            _check_compression(compress)
+            
+            # Processing may add entries to the temp directory
+            self._dirs_cache = None
             
             # Default output directory to temp_dir if not specified
             if not output_dir:
@@ -77,79 +929,164 @@ class RepositoryIngest:
             
             # Create identifier for files if not provided
             if not repo_id:
-                # Extract from repo_path - either directory name or last part of URL
-                if os.path.isdir(repo_path):
-                    repo_id = os.path.basename(os.path.normpath(repo_path))
-                else:
-                    # Assume it's a URL - get last part
-                    repo_id = repo_path.split('/')[-1]
-                    if repo_id.endswith('.git'):
-                        repo_id = repo_id[:-4]
+                repo_id = self._resolve_repo_id(repo_path)
                         
-            # Process with gitingest - it handles file filtering internally
-            summary, tree, content = gitingest.ingest(repo_path)
+            # Process with gitingest - it handles file filtering internally.
+            # gitingest.ingest runs its own event loop, so keep it off ours.
+            summary, tree, content = await asyncio.to_thread(self._ingest, repo_path)
             
-            # Create output filenames with repo identifier
-            summary_file = os.path.join(output_dir, f"{repo_id}_summary.txt")
-            tree_file = os.path.join(output_dir, f"{repo_id}_tree.txt")
-            content_file = os.path.join(output_dir, f"{repo_id}_content.txt")
-            metadata_file = os.path.join(output_dir, f"{repo_id}_metadata.json")
+            result = await self._write_outputs(
+                output_dir, repo_id, summary, tree, content,
+                processed_at or _timestamp(), compress
+            )
             
-            # Write output files
-            with open(summary_file, 'w', encoding='utf-8') as f:
-                f.write(summary)
+            logger.info("Repository processing complete. Output saved to %s", output_dir)
             
-            with open(tree_file, 'w', encoding='utf-8') as f:
-                f.write(tree)
-                
-            with open(content_file, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            # Create metadata with file paths and timestamps
-            metadata = {
-                "repository_id": repo_id,
-                "processed_at": str(datetime.datetime.now()),
-                "files": {
-                    "summary": summary_file,
-                    "tree": tree_file,
-                    "content": content_file,
-                },
-                "stats": {
-                    "summary_length": len(summary),
-                    "tree_length": len(tree),
-                    "content_length": len(content),
-                }
-            }
-            
-            # Write metadata
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2)
-            
-            logger.info(f"Repository processing complete. Output saved to {output_dir}")
-            
-            return {
-                "summary_file": summary_file,
-                "tree_file": tree_file,
-                "content_file": content_file,
-                "metadata_file": metadata_file,
-                "summary": summary,
-                "tree": tree,
-                "content": content
-            }
+            if return_text:
+                result.update(summary=summary, tree=tree, content=content)
+            
+            return result
+            
+        except Exception as e:
+            logger.error("Error processing repository: %s", e)
+            raise
+
+    def process_repositories(self,
+                             repo_paths: list,
+                             output_dir: Optional[str] = None,
+                             compress: Optional[str] = None) -> list:
+        """
+        Process several repositories in one batch.
+        
+        Synchronous wrapper around process_repositories_async.
+        
+        Args:
+            repo_paths: Paths to repository directories or Git URLs
+            output_dir: Directory to save output files (defaults to temp_dir)
+            compress: Compress the content files ('zstd' or 'gzip')
+            
+        Returns:
+            List of dictionaries with paths to output files, in input order
+        """
+        return asyncio.run(self.process_repositories_async(repo_paths, output_dir, compress))
+
+    async def process_repositories_async(self,
+                                         repo_paths: list,
+                                         output_dir: Optional[str] = None,
+                                         compress: Optional[str] = None) -> list:
+        """
+        Process several repositories in one batch.
+        
+        Repositories are ingested on a thread pool (gitingest spends most of its
+        time in git subprocesses and file I/O, which release the GIL) and each
+        one's output files are written as soon as its ingest finishes. Local
+        repositories made of many small files are CPU bound instead, so those
+        are handed to a pool of worker processes.
+        
+        Args:
+            repo_paths: Paths to repository directories or Git URLs
+            output_dir: Directory to save output files (defaults to temp_dir)
+            compress: Compress the content files ('zstd' or 'gzip')
+            
+        Returns:
+            List of dictionaries with paths to output files, in input order
+        """
+        try:
+            logger.info("Processing %s repositories", len(repo_paths))
+            
+            if not repo_paths:
+                return []
+            
+            # Fail before ingesting rather than after writing some of the files
+            _check_compression(compress)
+            
+            # Processing may add entries to the temp directory
+            self._dirs_cache = None
+            
+            # Default output directory to temp_dir if not specified
+            if not output_dir:
+                output_dir = self.temp_dir
+            
+            # Output files are named after the repo id, so two sources with the
+            # same id would overwrite each other's files
+            repo_ids = [self._resolve_repo_id(p) for p in repo_paths]
+            duplicates = sorted(i for i, n in Counter(repo_ids).items() if n > 1)
+            if duplicates:
+                raise ValueError(f"Duplicate repository identifiers in batch: {', '.join(duplicates)}")
+            
+            # One timestamp for the whole batch
+            processed_at = _timestamp()
+            clone_lock = threading.Lock()
+            loop = asyncio.get_running_loop()
+            
+            process_pool = None
+            process_pool_lock = threading.Lock()
+            
+            def run_in_worker(repo_path: str) -> Tuple[str, str, str]:
+                nonlocal process_pool
+                with process_pool_lock:
+                    if process_pool is None:
+                        process_pool = ProcessPoolExecutor(
+                            max_workers=min(os.cpu_count(), len(repo_paths)),
+                            # Forking a process that is running threads can deadlock
+                            mp_context=multiprocessing.get_context('spawn'),
+                        )
+                return process_pool.submit(_run_gitingest, repo_path).result()
+            
+            run_cpu_bound = run_in_worker if (os.cpu_count() or 1) > 1 else None
+            
+            try:
+                with ThreadPoolExecutor(max_workers=min(32, len(repo_paths))) as pool:
+                    def ingest(repo_path: str) -> Tuple[str, str, str]:
+                        if os.path.isdir(repo_path):
+                            return self._ingest(repo_path, run_cpu_bound)
+                        if not GITINGEST_SHARES_CLONE_DIR:
+                            return self._ingest(repo_path)
+                        with clone_lock:
+                            return self._ingest(repo_path)
+                    
+                    async def process_one(repo_path: str, repo_id: str) -> Dict[str, str]:
+                        summary, tree, content = await loop.run_in_executor(pool, ingest, repo_path)
+                        return await self._write_outputs(
+                            output_dir, repo_id, summary, tree, content, processed_at, compress
+                        )
+                    
+                    # Let every repository finish even if one fails, so no output
+                    # files are left half written
+                    results = await asyncio.gather(
+                        *(process_one(p, i) for p, i in zip(repo_paths, repo_ids)),
+                        return_exceptions=True
+                    )
+            finally:
+                # Only after the thread pool has drained, since its threads may
+                # still be waiting on the worker processes
+                if process_pool is not None:
+                    process_pool.shutdown()
+            
+            errors = [r for r in results if isinstance(r, BaseException)]
+            if errors:
+                raise errors[0]
+            
+            logger.info("Batch processing complete. Output saved to %s", output_dir)
+            
+            return list(results)
             
         except Exception as e:
-            logger.error(f"Error processing repository: {e}")
+            logger.error("Error processing repositories: %s", e)
             raise
 
-    def process_latest_repo(self, output_dir: Optional[str] = None) -> Dict[str, str]:
+    def process_latest_repo(self,
+                            output_dir: Optional[str] = None,
+                            compress: Optional[str] = None) -> Dict[str, str]:
         """
         Process the most recently added repository in the temp directory.
         
         Args:
             output_dir: Directory to save output files (defaults to temp_dir)
+            compress: Compress the content file ('zstd' or 'gzip')
             
         Returns:
-            Dictionary with paths to output files and processed content
+            Dictionary with paths to output files
         """
         try:
             repo_dirs = self.get_repo_dirs()
@@ -157,17 +1094,16 @@ class RepositoryIngest:
             if not repo_dirs:
                 raise ValueError("No repository directories found in the temporary directory")
                 
-            # Sort by creation time (newest first)
-            repo_dirs.sort(key=lambda d: os.path.getctime(os.path.join(self.temp_dir, d)), reverse=True)
-            latest_repo = repo_dirs[0]
+            # Pick the newest by creation time
+            latest_repo = max(repo_dirs, key=operator.itemgetter(1))[0]
             
             repo_path = os.path.join(self.temp_dir, latest_repo)
-            logger.info(f"Processing latest repository: {repo_path}")
+            logger.info("Processing latest repository: %s", repo_path)
             
-            return self.process_repository(repo_path, output_dir, latest_repo)
+            return self.process_repository(repo_path, output_dir, latest_repo, compress=compress)
             
         except Exception as e:
-            logger.error(f"Error processing latest repository: {e}")
+            logger.error("Error processing latest repository: %s", e)
             raise
 
 
@@ -199,6 +1135,16 @@ def main():
         '--repo-id',
         help='Repository identifier for output naming'
     )
+    parser.add_argument(
+        '--compress',
+        choices=sorted(COMPRESSION_SUFFIXES),
+        help='Compress the content file with the given format'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always run gitingest instead of reusing results for unchanged local repositories'
+    )
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -213,21 +1159,25 @@ def main():
         
     try:
         # Initialize processor
-        processor = RepositoryIngest(temp_dir=args.temp_dir)
+        processor = RepositoryIngest(temp_dir=args.temp_dir, use_cache=not args.no_cache)
         
         # Process based on arguments
         if args.repo:
             result = processor.process_repository(
                 args.repo,
                 output_dir=args.output_dir,
-                repo_id=args.repo_id
+                repo_id=args.repo_id,
+                compress=args.compress
             )
             print(f"Repository processed. Files saved to:")
             for key, path in result.items():
                 if key.endswith('_file'):
                     print(f"  {key}: {path}")
         elif args.latest:
-            result = processor.process_latest_repo(output_dir=args.output_dir)
+            result = processor.process_latest_repo(
+                output_dir=args.output_dir,
+                compress=args.compress
+            )
             print(f"Latest repository processed. Files saved to:")
             for key, path in result.items():
                 if key.endswith('_file'):
@@ -237,7 +1187,7 @@ def main():
             repo_dirs = processor.get_repo_dirs()
             if repo_dirs:
                 print("Available repositories:")
-                for i, repo in enumerate(repo_dirs):
+                for i, (repo, _) in enumerate(repo_dirs):
                     repo_path = os.path.join(processor.temp_dir, repo)
                     print(f"{i+1}. {repo} - {repo_path}")
                 print("\nRun with --repo <path> or --latest to process a repository")
@@ -245,9 +1195,14 @@ def main():
                 print("No repositories found in the temporary directory")
                 
     except Exception as e:
-        logger.error(f"Error: {e}")
+        logger.error("Error: %s", e)
         sys.exit(1)
 
 
 if __name__ == "__main__":
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
     main()
\ No newline at end of file